@@ -1,7 +1,7 @@
 """Request models for Build Orchestrator Service"""
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field, validator, field_validator
+from typing import Optional, Dict, Any, List, Union
 from enum import Enum
 
 
@@ -17,6 +17,21 @@ class LanguageType(str, Enum):
     RUBY = "Ruby"
 
 
+# Accepted (lowercased) spellings of each platform name
+_LANGUAGE_MAP = {
+    "java": LanguageType.JAVA,
+    "node.js": LanguageType.NODEJS,
+    "nodejs": LanguageType.NODEJS,
+    "python": LanguageType.PYTHON,
+    ".net": LanguageType.DOTNET,
+    "dotnet": LanguageType.DOTNET,
+    "go": LanguageType.GO,
+    "rust": LanguageType.RUST,
+    "ruby": LanguageType.RUBY,
+    "php": LanguageType.PHP
+}
+
+
 class FileType(str, Enum):
     """Types of files that can be generated"""
     POM_XML = "pom.xml"
@@ -106,7 +121,7 @@ class VersionConfig(BaseModel):
 
 class DetectionResult(BaseModel):
     """Detection result from the Detection Service"""
-    primary_language: str
+    primary_language: Union[LanguageType, str]
     framework: Optional[str] = None
     build_tool: Optional[str] = None
     build_required: bool = False
@@ -115,6 +130,14 @@ class DetectionResult(BaseModel):
     confidence_score: float = Field(..., ge=0.0, le=1.0)
     confidence_level: Optional[str] = None
     detected_files: List[str] = []
+    
+    @field_validator('primary_language', mode='before')
+    @classmethod
+    def normalize_language(cls, v):
+        """Map known platform spellings to LanguageType; unsupported names stay strings"""
+        if isinstance(v, str):
+            return _LANGUAGE_MAP.get(v.lower(), v)
+        return v
 
 
 class ValidationRequest(BaseModel):
@@ -210,9 +210,9 @@ class SuggestionEngine:
             List of suggestions ordered by priority
         """
         suggestions = []
-        language = self._normalize_language(detection_result.primary_language)
+        language = detection_result.primary_language
         
-        if not language or language not in self.suggestion_templates:
+        if language not in self.suggestion_templates:
             # Generic suggestions for unsupported platforms
             return self._generate_generic_suggestions(missing_files)
         
@@ -240,22 +240,6 @@ class SuggestionEngine:
         
         return unique_suggestions
     
-    def _normalize_language(self, language: str) -> Optional[LanguageType]:
-        """Normalize language string to LanguageType enum"""
-        language_map = {
-            "java": LanguageType.JAVA,
-            "node.js": LanguageType.NODEJS,
-            "nodejs": LanguageType.NODEJS,
-            "python": LanguageType.PYTHON,
-            ".net": LanguageType.DOTNET,
-            "dotnet": LanguageType.DOTNET,
-            "go": LanguageType.GO,
-            "rust": LanguageType.RUST,
-            "ruby": LanguageType.RUBY,
-            "php": LanguageType.PHP
-        }
-        return language_map.get(language.lower())
-    
     def _get_suggestions_for_file_type(
         self,
         templates: Dict,
@@ -10,9 +10,14 @@ Validates required build files for all supported platforms:
 """
 
 import os
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    from json import loads as _json_loads
+
 from models.request_models import DetectionResult, LanguageType
 from models.response_models import (
     MissingFile, 
@@ -22,12 +27,21 @@ from models.response_models import (
 )
 
 
+# Actions offered to the user for each validation outcome
+_ACTIONS_BY_STATUS: Dict[ValidationStatus, Tuple[str, ...]] = {
+    ValidationStatus.READY: ("build", "dockerize", "deploy"),
+    ValidationStatus.INCOMPLETE: ("generate_files", "dockerize"),
+    ValidationStatus.MISSING_FILES: ("generate_files", "manual_fix"),
+}
+
+
 class ValidationService:
     """Service for validating project build files"""
     
     def __init__(self):
         """Initialize validation service with platform-specific rules"""
         self.validation_rules = self._initialize_validation_rules()
+        self.compiled_rules = self._compile_validation_rules(self.validation_rules)
         self.version_options = self._initialize_version_options()
     
     def _initialize_validation_rules(self) -> Dict:
@@ -205,6 +219,13 @@ class ValidationService:
             }
         }
     
+    def _compile_validation_rules(self, validation_rules: Dict) -> Dict[LanguageType, Tuple[Dict, ...]]:
+        """Flatten required and optional rules into one ordered sequence per platform"""
+        return {
+            language: tuple(rules.get("required_files", [])) + tuple(rules.get("optional_files", []))
+            for language, rules in validation_rules.items()
+        }
+    
     def _initialize_version_options(self) -> Dict:
         """Define available version options for each platform"""
         return {
@@ -296,10 +317,11 @@ class ValidationService:
         Returns:
             Tuple of (status, missing_files, version_options)
         """
-        # Map string to enum if needed
-        language = self._normalize_language(detection_result.primary_language)
+        # primary_language is normalized to LanguageType by the request model
+        language = detection_result.primary_language
         
-        if language not in self.validation_rules:
+        compiled_rules = self.compiled_rules.get(language)
+        if compiled_rules is None:
             return (
                 ValidationStatus.ERROR,
                 [MissingFile(
@@ -312,18 +334,14 @@ class ValidationService:
                 {}
             )
         
-        rules = self.validation_rules[language]
         missing_files = []
+        has_critical = False
         
-        # Validate required files
-        for rule in rules.get("required_files", []):
-            if not self._check_files_exist(project_path, rule):
-                missing_files.extend(self._create_missing_file_entries(rule))
-        
-        # Check optional files (warnings only)
-        for rule in rules.get("optional_files", []):
+        # Validate required files first, then optional files (warnings only)
+        for rule in compiled_rules:
             if not self._check_files_exist(project_path, rule):
                 missing_files.extend(self._create_missing_file_entries(rule))
+                has_critical = has_critical or rule["severity"] == Severity.CRITICAL
         
         # Perform platform-specific validation
         additional_missing = self._platform_specific_validation(
@@ -331,12 +349,12 @@ class ValidationService:
             detection_result, 
             project_path
         )
-        missing_files.extend(additional_missing)
+        for missing_file in additional_missing:
+            missing_files.append(missing_file)
+            has_critical = has_critical or missing_file.severity == Severity.CRITICAL
         
         # Determine status
-        critical_missing = [f for f in missing_files if f.severity == Severity.CRITICAL]
-        
-        if critical_missing:
+        if has_critical:
             status = ValidationStatus.MISSING_FILES
         elif missing_files:
             status = ValidationStatus.INCOMPLETE
@@ -348,22 +366,6 @@ class ValidationService:
         
         return status, missing_files, version_options
     
-    def _normalize_language(self, language: str) -> Optional[LanguageType]:
-        """Normalize language string to LanguageType enum"""
-        language_map = {
-            "java": LanguageType.JAVA,
-            "node.js": LanguageType.NODEJS,
-            "nodejs": LanguageType.NODEJS,
-            "python": LanguageType.PYTHON,
-            ".net": LanguageType.DOTNET,
-            "dotnet": LanguageType.DOTNET,
-            "go": LanguageType.GO,
-            "rust": LanguageType.RUST,
-            "ruby": LanguageType.RUBY,
-            "php": LanguageType.PHP
-        }
-        return language_map.get(language.lower())
-    
     def _check_files_exist(self, project_path: str, rule: Dict) -> bool:
         """
         Check if files exist according to rule
@@ -404,40 +406,55 @@ class ValidationService:
     
     def _check_pattern_files(self, project_path: str, patterns: List[str]) -> bool:
         """Check if files matching patterns exist"""
+        # "*.ext" patterns become one suffix test per entry instead of a glob each
+        suffixes = []
+        other_patterns = []
+        for pattern in patterns:
+            if pattern.startswith("*.") and not any(c in pattern[1:] for c in "*?["):
+                suffixes.append(pattern[1:])
+            else:
+                other_patterns.append(pattern)
+        
         try:
+            if suffixes:
+                suffixes = tuple(suffixes)
+                with os.scandir(project_path) as it:
+                    if any(entry.name.endswith(suffixes) for entry in it):
+                        return True
+            
             base_path = Path(project_path)
-            for pattern in patterns:
-                matches = list(base_path.glob(pattern))
-                if matches:
+            for pattern in other_patterns:
+                if next(base_path.glob(pattern), None) is not None:
                     return True
             return False
         except Exception:
             return False
     
-    def _create_missing_file_entries(self, rule: Dict) -> List[MissingFile]:
-        """Create MissingFile entries from a rule"""
+    def _create_missing_file_entries(self, rule: Dict) -> Iterator[MissingFile]:
+        """Yield MissingFile entries from a rule"""
         files = rule["files"]
         any_of = rule.get("any_of", False)
         
         if any_of:
             # If any_of, create one entry for the group
             file_names = " OR ".join(files)
-            return [MissingFile(
+            yield MissingFile(
                 file_name=file_names,
                 file_type=rule["file_type"],
                 severity=rule["severity"],
                 description=rule["description"],
                 can_generate=rule["can_generate"]
-            )]
+            )
         else:
             # Create individual entries
-            return [MissingFile(
-                file_name=f,
-                file_type=rule["file_type"],
-                severity=rule["severity"],
-                description=rule["description"],
-                can_generate=rule["can_generate"]
-            ) for f in files]
+            for f in files:
+                yield MissingFile(
+                    file_name=f,
+                    file_type=rule["file_type"],
+                    severity=rule["severity"],
+                    description=rule["description"],
+                    can_generate=rule["can_generate"]
+                )
     
     def _platform_specific_validation(
         self,
@@ -477,18 +494,16 @@ class ValidationService:
             package_json_path = Path(project_path) / "package.json"
             if package_json_path.exists():
                 try:
-                    import json
-                    with open(package_json_path, 'r') as f:
-                        data = json.load(f)
-                        scripts = data.get("scripts", {})
-                        if "build" not in scripts:
-                            missing.append(MissingFile(
-                                file_name="build script in package.json",
-                                file_type="build_script",
-                                severity=Severity.WARNING,
-                                description="Frontend framework detected but no build script found",
-                                can_generate=True
-                            ))
+                    data = _json_loads(package_json_path.read_bytes())
+                    scripts = data.get("scripts", {})
+                    if "build" not in scripts:
+                        missing.append(MissingFile(
+                            file_name="build script in package.json",
+                            file_type="build_script",
+                            severity=Severity.WARNING,
+                            description="Frontend framework detected but no build script found",
+                            can_generate=True
+                        ))
                 except Exception:
                     pass
         
@@ -514,11 +529,4 @@ class ValidationService:
         Returns:
             List of available action names
         """
-        if status == ValidationStatus.READY:
-            return ["build", "dockerize", "deploy"]
-        elif status == ValidationStatus.INCOMPLETE:
-            return ["generate_files", "dockerize"]
-        elif status == ValidationStatus.MISSING_FILES:
-            return ["generate_files", "manual_fix"]
-        else:
-            return []
+        return list(_ACTIONS_BY_STATUS.get(status, ()))
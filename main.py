@@ -1,6 +1,10 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routes.scan import router as scan_router
+from services.detector import ProjectDetector
+from services.repo_handler import RepoHandler
+from services.scan_cache import ScanCache
 
 app = FastAPI(
     title="Project Detection API",
@@ -8,6 +12,16 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Shared service instances; neither keeps results between scans (see ScanCache)
+app.state.detector = ProjectDetector()
+app.state.repo_handler = RepoHandler()
+
+# Results for byte-identical repositories, kept in memory and under the user cache dir
+app.state.scan_cache = ScanCache(
+    maxsize=256,
+    cache_dir=os.path.join(os.path.expanduser("~"), ".cache", "deploy_pilot", "scans")
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +34,11 @@ app.add_middleware(
 # Include routers
 app.include_router(scan_router)
 
+@app.on_event("shutdown")
+def close_detector():
+    """Stop the shared detector's scan threads"""
+    app.state.detector.close()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
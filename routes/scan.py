@@ -1,18 +1,81 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Request
+from typing import Optional, Tuple
 import asyncio
+import hashlib
+import os
+import tempfile
+
+import aiofiles
 
 from models.response_models import MultiDetectionResult, ScanRequest
 from services.repo_handler import RepoHandler
 from services.detector import ProjectDetector
+from services.scan_cache import ScanCache
 
 router = APIRouter(prefix="/api", tags=["scan"])
 
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
+# Threshold used when the client does not send min_confidence
+DEFAULT_MIN_CONFIDENCE = 0.45
+
+async def _save_upload(upload: UploadFile, max_size_bytes: int) -> Tuple[str, str]:
+    """
+    Stream an uploaded file to a temporary file without buffering it in memory
+    
+    Args:
+        upload: Uploaded file
+        max_size_bytes: Abort once the upload grows past this size
+    
+    Returns:
+        Path to the temporary file (caller is responsible for removing it)
+        and the hex digest of its contents
+    """
+    fd, path = tempfile.mkstemp(prefix="upload_", suffix=".zip")
+    os.close(fd)
+    digest = hashlib.blake2b(digest_size=16)
+    
+    try:
+        size = 0
+        async with aiofiles.open(path, 'wb') as out:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size_bytes:
+                    raise ValueError(f"ZIP file size exceeds {max_size_bytes // (1024 * 1024)}MB limit")
+                digest.update(chunk)
+                await out.write(chunk)
+    except Exception:
+        os.unlink(path)
+        raise
+    
+    return path, digest.hexdigest()
+
+def _cache_key(content_id: str, min_confidence: float) -> str:
+    """Cache key for a repository identity scanned at a given threshold"""
+    digest = hashlib.blake2b(content_id.encode(), digest_size=16).hexdigest()
+    return f"{digest}-{min_confidence}"
+
+def get_detector(request: Request) -> ProjectDetector:
+    """Shared ProjectDetector created at application startup"""
+    return request.app.state.detector
+
+def get_repo_handler(request: Request) -> RepoHandler:
+    """Shared RepoHandler created at application startup"""
+    return request.app.state.repo_handler
+
+def get_scan_cache(request: Request) -> ScanCache:
+    """Shared ScanCache created at application startup"""
+    return request.app.state.scan_cache
+
 @router.post("/scan", response_model=MultiDetectionResult)
 async def scan_repository(
     github_url: Optional[str] = Form(None),
     zip_file: Optional[UploadFile] = File(None),
-    min_confidence: Optional[float] = Form(0.45)
+    min_confidence: float = Form(DEFAULT_MIN_CONFIDENCE, ge=0.0, le=1.0),
+    detector: ProjectDetector = Depends(get_detector),
+    repo_handler: RepoHandler = Depends(get_repo_handler),
+    scan_cache: ScanCache = Depends(get_scan_cache)
 ):
     """
     Scan a repository for platform detection
@@ -38,31 +101,44 @@ async def scan_repository(
             detail="Either github_url or zip_file must be provided"
         )
     
-    # Validate min_confidence
-    if min_confidence is not None and not (0.0 <= min_confidence <= 1.0):
-        raise HTTPException(
-            status_code=400,
-            detail="min_confidence must be between 0.0 and 1.0"
-        )
-    
-    repo_handler = RepoHandler()
-    detector = ProjectDetector(min_confidence=min_confidence or 0.45)
     repo_path = None
+    zip_path = None
+    cache_key = None
     
     try:
-        # Process repository
+        # Extraction, cloning, cache I/O and scanning all block, so keep them off the event loop
         if zip_file:
-            zip_content = await zip_file.read()
-            repo_path = repo_handler.process_repository(zip_file=zip_content)
+            zip_path, content_hash = await _save_upload(zip_file, repo_handler.max_size_bytes)
+            cache_key = _cache_key(content_hash, min_confidence)
+            repo_path = await asyncio.to_thread(
+                repo_handler.process_repository, zip_path=zip_path
+            )
         else:
-            repo_path = repo_handler.process_repository(github_url=github_url)
+            repo_path = await asyncio.to_thread(
+                repo_handler.process_repository, github_url=github_url
+            )
+            commit = await asyncio.to_thread(repo_handler.get_head_commit, repo_path)
+            if commit:
+                cache_key = _cache_key(f"{github_url}@{commit}", min_confidence)
+        
+        # Every request owns the tree it extracted or cloned; identical content
+        # only lets it reuse the detections, pointed at its own tree
+        if cache_key:
+            cached = await asyncio.to_thread(scan_cache.get, cache_key, repo_path)
+            if cached is not None:
+                return cached
         
         # Perform detection
-        results = detector.scan_project(repo_path)
+        results = await asyncio.to_thread(
+            detector.scan_project, repo_path, min_confidence=min_confidence
+        )
         
         # Add project_path to results for Build Orchestrator
         results.project_path = repo_path
         
+        if cache_key:
+            await asyncio.to_thread(scan_cache.put, cache_key, results)
+        
         return results
         
     except ValueError as e:
@@ -71,6 +147,10 @@ async def scan_repository(
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        # The uploaded archive is only needed until extraction completes
+        if zip_path and os.path.exists(zip_path):
+            os.unlink(zip_path)
     
     # Note: We don't cleanup the repo_path here anymore because Build Orchestrator needs to access it
     # Cleanup should be handled separately (e.g., periodic cleanup job or after orchestration completes)
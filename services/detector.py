@@ -1,43 +1,286 @@
 import os
-import json
-import glob
-from typing import List, Dict, Tuple, Optional, Set
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet, Iterable, Iterator, Callable, NamedTuple
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    from json import loads as _json_loads
+
 from models.response_models import (
     DetectionResult, LanguageType, BuildTool, MultiDetectionResult, ConfidenceLevel
 )
-from services.rules import DetectionRules
+from services.rules import DetectionRules, PatternTable, PlatformEntry, RULES
+
+# Threads used to list directories concurrently; listing is I/O bound and releases the GIL
+SCAN_WORKERS = 16
+
+
+# Language type and whether a build step is required, per platform
+_LANGUAGE_INFO: Dict[str, Tuple[LanguageType, bool]] = {
+    "java": (LanguageType.JAVA, True),
+    "nodejs": (LanguageType.NODEJS, True),
+    "python": (LanguageType.PYTHON, False),
+    "dotnet": (LanguageType.DOTNET, True),
+    "go": (LanguageType.GO, True),
+    "rust": (LanguageType.RUST, True),
+    "php": (LanguageType.PHP, False),
+    "ruby": (LanguageType.RUBY, False)
+}
+
+# Build tool implied by any primary file, for platforms with a single build tool
+_PLATFORM_BUILD_TOOLS: Dict[str, BuildTool] = {
+    "dotnet": BuildTool.DOTNET,
+    "go": BuildTool.GO,
+    "python": BuildTool.PIP,
+    "rust": BuildTool.CARGO,
+    "php": BuildTool.COMPOSER,
+    "ruby": BuildTool.BUNDLE
+}
+
+# Node.js lock files in priority order, with the build tool each implies
+_NODEJS_LOCK_FILES: Tuple[Tuple[str, BuildTool], ...] = (
+    ("pnpm-lock.yaml", BuildTool.PNPM),
+    ("yarn.lock", BuildTool.YARN),
+    ("package-lock.json", BuildTool.NPM)
+)
+
+@functools.lru_cache(maxsize=256)
+def _load_package_deps(path: str, mtime_ns: int) -> FrozenSet[str]:
+    """
+    Names of all dependencies declared in a package.json.
+    
+    mtime_ns is only part of the cache key, so an edited file is parsed again.
+    """
+    with open(path, 'rb') as f:
+        package_data = _json_loads(f.read())
+    
+    deps = set()
+    deps.update(package_data.get("dependencies", {}))
+    deps.update(package_data.get("devDependencies", {}))
+    deps.update(package_data.get("peerDependencies", {}))
+    return frozenset(deps)
+
+class FileIndex:
+    """Per-scan lookup tables over the scanned file list, built in a single pass"""
+    
+    def __init__(self, file_entries: Iterable[Tuple[str, os.DirEntry]], patterns: PatternTable):
+        """
+        Index scanned files and classify each one against all platform patterns.
+        
+        Args:
+            file_entries: (relative_path, DirEntry) pairs from the directory scan
+            patterns: Compiled primary/secondary patterns from DetectionRules
+        """
+        # Name maps only hold names some rule looks up (PatternTable.indexed_*)
+        self.files: List[str] = []
+        self.by_basename: Dict[str, List[str]] = {}
+        self.by_suffix: Dict[str, List[str]] = {}
+        self.by_stem: Dict[str, List[str]] = {}  # basename without its extension
+        self.hits: Dict[int, List[str]] = {}  # pattern id -> matching files
+        self.dir_paths: Set[str] = set()      # every directory holding a scanned file
+        self.dir_names: Set[str] = set()      # basenames of those directories
+        self.lowered: Dict[str, bytes] = {}   # path -> lower-cased head, for content patterns
+        self.exists: Dict[str, bool] = {}     # relative path -> os.path.exists result
+        self.special_files: Set[str] = set()  # scanned entries that are not regular files
+        indexed_basenames = patterns.indexed_basenames
+        indexed_suffixes = patterns.indexed_suffixes
+        indexed_stems = patterns.indexed_stems
+        
+        for relative_path, entry in file_entries:
+            name = entry.name
+            stem, suffix = os.path.splitext(name)
+            self.files.append(relative_path)
+            # is_file() reuses the d_type from the walk (only symlinks cost a stat)
+            if not entry.is_file():
+                self.special_files.add(relative_path)
+            if name in indexed_basenames:
+                self.by_basename.setdefault(name, []).append(relative_path)
+            if suffix in indexed_suffixes:
+                self.by_suffix.setdefault(suffix, []).append(relative_path)
+            if stem in indexed_stems:
+                self.by_stem.setdefault(stem, []).append(relative_path)
+            
+            parent = relative_path.rpartition("/")[0]
+            while parent and parent not in self.dir_paths:
+                self.dir_paths.add(parent)
+                parent, _, dir_name = parent.rpartition("/")
+                self.dir_names.add(dir_name)
+            
+            for pattern_id in patterns.by_basename.get(name, ()):
+                self.hits.setdefault(pattern_id, []).append(relative_path)
+            for pattern_id in patterns.by_suffix.get(suffix, ()):
+                self.hits.setdefault(pattern_id, []).append(relative_path)
+            for fragment, pattern_id in patterns.by_fragment:
+                if fragment in relative_path:
+                    self.hits.setdefault(pattern_id, []).append(relative_path)
+    
+    @functools.cached_property
+    def joined_paths(self) -> str:
+        """All scanned paths, newline-separated, for one-pass substring tests"""
+        return "\n".join(self.files)
+    
+    def files_matching(self, file_pattern: str) -> List[str]:
+        """Files matching an exact file name or a "*<extension>" pattern"""
+        if file_pattern.startswith("*"):
+            return self.by_suffix.get(file_pattern[1:], [])
+        return self.by_basename.get(file_pattern, [])
+    
+    def has_config_file(self, config_file: str) -> bool:
+        """Check for a config file by name, also accepting an added extension (rust-toolchain.toml)"""
+        if "/" in config_file:
+            return config_file in self.joined_paths
+        return config_file in self.by_basename or config_file in self.by_stem
+    
+    def has_path(self, project_path: str, relative_path: str) -> bool:
+        """
+        Check whether a path exists under the project. Directories holding a scanned
+        file are known from the walk; anything else is stat'ed once per scan.
+        """
+        if relative_path in self.dir_paths:
+            return True
+        exists = self.exists.get(relative_path)
+        if exists is None:
+            exists = os.path.exists(project_path + os.sep + relative_path)
+            self.exists[relative_path] = exists
+        return exists
+    
+    def has_indicator(self, indicator: str) -> bool:
+        """Check whether a file name, extension, directory or path fragment was scanned"""
+        if (indicator in self.by_basename or indicator in self.by_suffix
+                or indicator in self.dir_names):
+            return True
+        if "/" in indicator:
+            # Path fragments (e.g. "app/Http") are rare enough to match by substring
+            return indicator in self.dir_paths or indicator in self.joined_paths
+        return False
+
+class PlatformHits(NamedTuple):
+    """Primary/secondary file matches of one platform within a scan"""
+    primary_found: int
+    secondary_found: int
+    detected_files: Set[str]
+    build_tool: Optional[BuildTool]
 
 class ProjectDetector:
     """Core detection engine for project platforms"""
     
-    def __init__(self, min_confidence: float = 0.45):
+    def __init__(
+        self,
+        min_confidence: float = 0.45,
+        rules: DetectionRules = RULES,
+        result_cache_size: int = 0
+    ):
         """
         Initialize detector with minimum confidence threshold.
         
         Args:
             min_confidence: Minimum confidence score to consider valid (default: 0.45)
+            rules: Detection rules to apply (default: the shared RULES instance)
+            result_cache_size: Scan results to memoise per (real path, root mtime, options);
+                0 (the default) disables the cache. Only changes to the root directory
+                itself invalidate an entry, so enable it only for trees that are not
+                edited in place, or call clear_cache() after editing one
         """
-        self.rules = DetectionRules()
+        self.rules = rules
+        self.ignored_dirs = self.rules.IGNORED_DIRS
+        self.patterns = self.rules.compiled_patterns()
+        self.platforms = tuple(
+            (platform, self._make_classifier(platform))
+            for platform in self.rules.platform_table()
+        )
+        self.score = self._make_scorer()
+        self.content_matchers = self.rules.content_matchers()
+        # (platform, build tool) -> (build command, install command)
+        self._commands: Dict[Tuple[str, Optional[BuildTool]], Tuple[Optional[str], Optional[str]]] = {}
         self.min_confidence = max(0.0, min(1.0, min_confidence))
+        # Shared across scans; threads are only started once a scan needs them
+        self.executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="scan")
+        self.result_cache_size = result_cache_size
+        self._results: "OrderedDict[tuple, MultiDetectionResult]" = OrderedDict()
+        self._results_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Shut down the scan thread pool; the detector cannot scan afterwards"""
+        self.executor.shutdown(wait=True)
+    
+    def __enter__(self) -> "ProjectDetector":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
-    def scan_project(self, project_path: str, max_depth: int = 3) -> MultiDetectionResult:
+    def clear_cache(self) -> None:
+        """Forget all memoised scan results"""
+        with self._results_lock:
+            self._results.clear()
+    
+    def scan_project(
+        self,
+        project_path: str,
+        max_depth: int = 3,
+        min_confidence: Optional[float] = None
+    ) -> MultiDetectionResult:
         """
         Main entry point for project scanning.
         
         Args:
             project_path: Root path of the project to scan
             max_depth: Maximum directory depth to scan (default: 3)
+            min_confidence: Threshold for this scan only (default: the detector's own)
             
         Returns:
             MultiDetectionResult with all detections and primary detection
         """
-        detected_files = self._scan_directory(project_path, max_depth)
-        detections = self._analyze_files(detected_files, project_path)
+        if min_confidence is None:
+            min_confidence = self.min_confidence
+        else:
+            min_confidence = max(0.0, min(1.0, min_confidence))
+        
+        cache_key = None
+        if self.result_cache_size > 0:
+            try:
+                cache_key = (
+                    os.path.realpath(project_path), os.stat(project_path).st_mtime_ns,
+                    max_depth, min_confidence
+                )
+            except OSError:
+                pass
+        
+        if cache_key is None:
+            return self._scan_uncached(project_path, max_depth, min_confidence)
+        
+        with self._results_lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+        
+        if cached is None:
+            cached = self._scan_uncached(project_path, max_depth, min_confidence)
+            with self._results_lock:
+                self._results[cache_key] = cached
+                while len(self._results) > self.result_cache_size:
+                    self._results.popitem(last=False)
+        
+        # Results are mutable models that callers annotate, so never hand out the cached one
+        return cached.model_copy(deep=True)
+    
+    def _scan_uncached(
+        self,
+        project_path: str,
+        max_depth: int,
+        min_confidence: float
+    ) -> MultiDetectionResult:
+        """Scan and score project_path without consulting the result cache"""
+        file_entries = self._scan_directory_stream(project_path, max_depth)
+        detections = self._analyze_files(file_entries, project_path)
         
         # Filter by minimum confidence threshold
-        valid_detections = [d for d in detections if d.confidence_score >= self.min_confidence]
+        valid_detections = [d for d in detections if d.confidence_score >= min_confidence]
         
         if not valid_detections:
             # If no valid detections, include all but mark as unreliable
@@ -52,65 +295,266 @@ class ProjectDetector:
         return MultiDetectionResult(
             detections=valid_detections,
             primary=valid_detections[0],
-            min_confidence_threshold=self.min_confidence
+            min_confidence_threshold=min_confidence
         )
     
-    def _scan_directory(self, path: str, max_depth: int) -> List[str]:
-        """Recursively scan directory for relevant files"""
-        detected_files = []
+    def _make_classifier(self, platform: PlatformEntry) -> Callable[[FileIndex], PlatformHits]:
+        """
+        Build a classifier specialized for one platform's primary/secondary patterns.
         
-        for root, dirs, files in os.walk(path):
-            # Calculate current depth
-            depth = root[len(path):].count(os.sep)
-            if depth >= max_depth:
-                dirs.clear()
-                continue
+        Pattern ids and the build-tool rule are resolved here, once, so the returned
+        closure only reads the scan's pattern hits.
+        """
+        primary_ids = platform.primary_ids
+        secondary_ids = platform.secondary_ids
+        is_java = platform.name == "java"
+        is_nodejs = platform.name == "nodejs"
+        fixed_build_tool = _PLATFORM_BUILD_TOOLS.get(platform.name)
+        
+        def classify(index: FileIndex) -> PlatformHits:
+            hits = index.hits
+            detected_files: Set[str] = set()
+            build_tool = None
+            
+            primary_found = 0
+            for pattern_id in primary_ids:
+                matches = hits.get(pattern_id)
+                if matches:
+                    primary_found += 1
+                    detected_files.update(matches)
+                    
+                    # Determine build tool from primary files
+                    if fixed_build_tool is not None:
+                        build_tool = fixed_build_tool
+                    elif is_java:
+                        if "pom.xml" in matches:
+                            build_tool = BuildTool.MAVEN
+                        elif any("gradle" in m for m in matches):
+                            build_tool = BuildTool.GRADLE
+                    elif is_nodejs:
+                        build_tool = self._detect_nodejs_build_tool(index.by_basename)
             
-            # Filter ignored directories
-            dirs[:] = [d for d in dirs if d not in self.rules.IGNORED_DIRS]
+            secondary_found = 0
+            for pattern_id in secondary_ids:
+                matches = hits.get(pattern_id)
+                if matches:
+                    secondary_found += 1
+                    detected_files.update(matches)
             
-            # Add relevant files
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, path)
-                detected_files.append(relative_path)
+            return PlatformHits(primary_found, secondary_found, detected_files, build_tool)
         
-        return detected_files
+        return classify
+    
+    def _make_scorer(self) -> Callable[[int, int, int, int, bool, int], float]:
+        """
+        Build the confidence formula with SCORE_WEIGHTS bound as closure constants.
+        
+        Each evidence kind adds half its weight per item found, capped at its weight;
+        primary files and a framework match add their full weight once.
+        """
+        weights = self.rules.SCORE_WEIGHTS
+        primary_weight = weights["primary_file"]
+        secondary_weight = weights["secondary_file"]
+        structure_weight = weights["structure_indicator"]
+        config_weight = weights["config_file"]
+        framework_weight = weights["framework_match"]
+        content_weight = weights["content_match"]
+        secondary_step = secondary_weight / 2
+        structure_step = structure_weight / 2
+        config_step = config_weight / 2
+        content_step = content_weight / 2
+        
+        def score(
+            primary_found: int,
+            secondary_found: int,
+            structure_found: int,
+            config_found: int,
+            framework_found: bool,
+            content_matches: int
+        ) -> float:
+            total = 0.0
+            if primary_found > 0:
+                total += primary_weight
+            if secondary_found > 0:
+                total += min(secondary_found * secondary_step, secondary_weight)
+            if structure_found > 0:
+                total += min(structure_found * structure_step, structure_weight)
+            if config_found > 0:
+                total += min(config_found * config_step, config_weight)
+            if framework_found:
+                total += framework_weight
+            if content_matches > 0:
+                total += min(content_matches * content_step, content_weight)
+            return min(total, 1.0)
+        
+        return score
     
-    def _analyze_files(self, files: List[str], project_path: str) -> List[DetectionResult]:
+    def _scan_directory_stream(self, path: str, max_depth: int) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield (relative_path, DirEntry) for every file up to max_depth"""
+        listings = None
+        if max_depth > 1:
+            listings = self._list_tree_parallel(path, max_depth)
+        return self._walk(path, "", 0, max_depth, listings)
+    
+    def _list_directory(
+        self,
+        dir_path: str,
+        depth: int,
+        max_depth: int
+    ) -> Tuple[List[os.DirEntry], List[os.DirEntry]]:
+        """
+        List one directory with os.scandir.
+        
+        Returns:
+            Files in dir_path, and the subdirectories that should be descended into
+        """
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    # DirEntry caches the d_type from readdir, so no extra stat here.
+                    # The type is needed before the ignore test: a *file* named like an
+                    # ignored directory (a "build" script, a "target" file) is still scanned
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.ignored_dirs and depth + 1 < max_depth:
+                            subdirs.append(entry)
+                    elif not entry.is_dir():
+                        # Symlinked directories are neither followed nor reported as files
+                        files.append(entry)
+        except OSError:
+            pass
+        return files, subdirs
+    
+    def _list_tree_parallel(
+        self,
+        path: str,
+        max_depth: int
+    ) -> Dict[str, Tuple[List[os.DirEntry], List[os.DirEntry]]]:
+        """
+        List every directory up to max_depth, one depth level at a time, with the
+        directories of each level listed concurrently on the shared executor.
+        
+        Args:
+            path: Scan root
+            max_depth: Directories at this depth or deeper are not listed
+        
+        Returns:
+            Listing per directory path, as returned by _list_directory
+        """
+        listings = {}
+        level = [path]
+        depth = 0
+        while level:
+            results = self.executor.map(
+                lambda dir_path, depth=depth: self._list_directory(dir_path, depth, max_depth),
+                level
+            )
+            next_level = []
+            for dir_path, listing in zip(level, results):
+                listings[dir_path] = listing
+                next_level.extend(entry.path for entry in listing[1])
+            level = next_level
+            depth += 1
+        return listings
+    
+    def _walk(
+        self,
+        dir_path: str,
+        rel_prefix: str,
+        depth: int,
+        max_depth: int,
+        listings: Optional[Dict[str, Tuple[List[os.DirEntry], List[os.DirEntry]]]] = None
+    ) -> Iterator[Tuple[str, os.DirEntry]]:
+        """
+        Walk one directory, yielding its files before descending.
+        
+        Args:
+            dir_path: Absolute path of the directory to list
+            rel_prefix: "/"-separated path of dir_path relative to the scan root ("" for the root)
+            depth: Depth of dir_path below the scan root
+            max_depth: Directories at this depth or deeper are not listed
+            listings: Directory listings gathered up front; listed on demand when None
+        """
+        if depth >= max_depth:
+            return
+        
+        if listings is None:
+            files, subdirs = self._list_directory(dir_path, depth, max_depth)
+        else:
+            files, subdirs = listings[dir_path]
+        
+        prefix = rel_prefix + "/" if rel_prefix else ""
+        for entry in files:
+            yield prefix + entry.name, entry
+        
+        for entry in subdirs:
+            yield from self._walk(entry.path, prefix + entry.name, depth + 1, max_depth, listings)
+    
+    def _analyze_files(
+        self,
+        file_entries: Iterable[Tuple[str, os.DirEntry]],
+        project_path: str
+    ) -> List[DetectionResult]:
         """Analyze detected files to determine platforms"""
-        results = []
+        index = FileIndex(file_entries, self.patterns)
         
-        # Check each platform
-        for platform, platform_data in self.rules.PLATFORM_FILES.items():
-            detection = self._detect_platform(platform, files, project_path)
-            if detection.confidence_score > 0:
-                results.append(detection)
+        # Check each platform; platforms are independent and their file reads
+        # overlap on the executor (contents are shared through the index)
+        detections = self.executor.map(
+            lambda item: self._detect_platform(item[0], item[1], index, project_path),
+            self.platforms
+        )
         
-        return results
+        return [detection for detection in detections if detection.confidence_score > 0]
     
-    def _read_file_content(self, file_path: str, max_bytes: int = 50000) -> str:
+    def _read_file_bytes(self, file_path: str, max_bytes: int = 50000) -> bytes:
         """
-        Safely read file content for pattern matching.
+        Safely read raw file content for pattern matching, without decoding it.
         
         Args:
             file_path: Path to the file
-            max_bytes: Maximum bytes to read (default 50KB)
+            max_bytes: Maximum bytes to read (default 50KB, -1 for the whole file)
             
         Returns:
-            File content as string, or empty string on error
+            File content as bytes, or b"" on error
         """
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            with open(file_path, 'rb') as f:
                 return f.read(max_bytes)
         except Exception:
-            return ""
+            return b""
+    
+    def _read_lowered_bytes(
+        self,
+        file_path: str,
+        cache: Dict[str, bytes],
+        max_bytes: Optional[int] = None
+    ) -> bytes:
+        """
+        Read the head of a file as lower-cased bytes, skipping UTF-8 decoding.
+        
+        Args:
+            file_path: Path to the file
+            cache: Per-scan lowered contents (FileIndex.lowered)
+            max_bytes: Maximum bytes to read (default: rules.CONTENT_SCAN_LIMIT)
+            
+        Returns:
+            ASCII-lower-cased bytes, or b"" on error
+        """
+        content = cache.get(file_path)
+        if content is None:
+            if max_bytes is None:
+                max_bytes = self.rules.CONTENT_SCAN_LIMIT
+            content = self._read_file_bytes(file_path, max_bytes).lower()
+            cache[file_path] = content
+        return content
     
     def _check_content_patterns(
         self,
-        platform: str,
+        platform: PlatformEntry,
         project_path: str,
-        files: List[str]
+        index: FileIndex
     ) -> int:
         """
         Check file contents for platform-specific patterns.
@@ -118,57 +562,49 @@ class ProjectDetector:
         Args:
             platform: Platform to check
             project_path: Root path of project
-            files: List of found files
+            index: File index of the current scan
             
         Returns:
             Number of content pattern matches
         """
-        platform_data = self.rules.PLATFORM_FILES.get(platform, {})
-        content_patterns = platform_data.get("content_patterns", {})
+        content_patterns = self.content_matchers[platform.name]
         
         if not content_patterns:
             return 0
         
         matches = 0
         checked_files = set()
+        # Relative paths come from the walk, so plain concatenation is a valid join
+        root = project_path + os.sep
         
-        for file_pattern, patterns in content_patterns.items():
-            # Find files matching the pattern
-            for file_rel_path in files:
-                file_name = os.path.basename(file_rel_path)
-                
+        for file_pattern, contains_any in content_patterns:
+            # Find files matching the pattern (exact name or "*<extension>") in the index
+            for file_rel_path in index.files_matching(file_pattern):
                 # Avoid checking the same file multiple times
                 if file_rel_path in checked_files:
                     continue
                 
-                # Check if file matches the pattern (support wildcards)
-                pattern_match = False
-                if file_pattern.startswith("*"):
-                    pattern_match = file_name.endswith(file_pattern[1:])
-                else:
-                    pattern_match = (file_pattern == file_name)
+                checked_files.add(file_rel_path)
                 
-                if pattern_match:
-                    checked_files.add(file_rel_path)
-                    file_path = os.path.join(project_path, file_rel_path)
-                    
-                    if not os.path.isfile(file_path):
-                        continue
-                    
-                    content = self._read_file_content(file_path)
-                    
-                    # Check for patterns in content
-                    for pattern in patterns:
-                        if pattern.lower() in content.lower():
-                            matches += 1
-                            break  # Count once per file
+                # Sockets, FIFOs and broken links are known from the walk; no stat needed
+                if file_rel_path in index.special_files:
+                    continue
+                file_path = root + file_rel_path
+                
+                # Patterns are lower-cased byte strings in the platform table
+                content = self._read_lowered_bytes(file_path, index.lowered)
+                
+                # Check for patterns in content
+                if contains_any(content):
+                    matches += 1  # Count once per file
         
         return matches
     
     def _check_structure_indicators(
         self,
-        platform: str,
-        project_path: str
+        platform: PlatformEntry,
+        project_path: str,
+        index: FileIndex
     ) -> int:
         """
         Check for platform-specific directory structures.
@@ -176,146 +612,67 @@ class ProjectDetector:
         Args:
             platform: Platform to check
             project_path: Root path of project
+            index: File index of the current scan
             
         Returns:
             Number of structure indicators found
         """
-        platform_data = self.rules.PLATFORM_FILES.get(platform, {})
-        structure_indicators = platform_data.get("structure_indicators", [])
+        structure_indicators = platform.structure_indicators
         
         if not structure_indicators:
             return 0
         
-        found = 0
-        for indicator in structure_indicators:
-            indicator_path = os.path.join(project_path, indicator)
-            if os.path.exists(indicator_path):
-                found += 1
-        
-        return found
+        return sum(1 for indicator in structure_indicators if index.has_path(project_path, indicator))
     
     def _check_config_files(
         self,
-        platform: str,
-        files: List[str]
+        platform: PlatformEntry,
+        index: FileIndex
     ) -> int:
         """
         Check for platform-specific configuration files.
         
         Args:
             platform: Platform to check
-            files: List of found files
+            index: File index of the current scan
             
         Returns:
             Number of config files found
         """
-        platform_data = self.rules.PLATFORM_FILES.get(platform, {})
-        config_files = platform_data.get("config_files", [])
+        config_files = platform.config_files
         
         if not config_files:
             return 0
         
-        found = 0
-        for config_file in config_files:
-            if any(config_file in f for f in files):
-                found += 1
-        
-        return found
+        return sum(1 for config_file in config_files if index.has_config_file(config_file))
     
-    def _detect_platform(self, platform: str, files: List[str], project_path: str) -> DetectionResult:
+    def _detect_platform(
+        self,
+        platform: PlatformEntry,
+        classify: Callable[[FileIndex], PlatformHits],
+        index: FileIndex,
+        project_path: str
+    ) -> DetectionResult:
         """Detect specific platform from file list with enhanced scoring"""
-        platform_data = self.rules.PLATFORM_FILES[platform]
-        score = 0.0
-        detected_files = []
-        framework = None
-        build_tool = None
-        
-        # Check primary files
-        primary_found = 0
-        for pattern in platform_data["primary"]:
-            matches = self._find_pattern_matches(pattern, files)
-            if matches:
-                primary_found += 1
-                detected_files.extend(matches)
-                
-                # Determine build tool from primary files
-                if platform == "java":
-                    if "pom.xml" in matches:
-                        build_tool = BuildTool.MAVEN
-                    elif any("gradle" in m for m in matches):
-                        build_tool = BuildTool.GRADLE
-                elif platform == "nodejs":
-                    build_tool = self._detect_nodejs_build_tool(files, project_path)
-                elif platform == "dotnet":
-                    build_tool = BuildTool.DOTNET
-                elif platform == "go":
-                    build_tool = BuildTool.GO
-                elif platform == "python":
-                    build_tool = BuildTool.PIP
-                elif platform == "rust":
-                    build_tool = BuildTool.CARGO
-                elif platform == "php":
-                    build_tool = BuildTool.COMPOSER
-                elif platform == "ruby":
-                    build_tool = BuildTool.BUNDLE
-        
-        # Award points for primary files (cap at weight value)
-        if primary_found > 0:
-            score += self.rules.SCORE_WEIGHTS["primary_file"]
-        
-        # Check secondary files
-        secondary_found = 0
-        for pattern in platform_data["secondary"]:
-            matches = self._find_pattern_matches(pattern, files)
-            if matches:
-                secondary_found += 1
-                detected_files.extend(matches)
-        
-        # Award points for secondary files (scaled by number found, capped)
-        if secondary_found > 0:
-            secondary_score = min(
-                secondary_found * (self.rules.SCORE_WEIGHTS["secondary_file"] / 2),
-                self.rules.SCORE_WEIGHTS["secondary_file"]
-            )
-            score += secondary_score
-        
-        # Check structure indicators (NEW)
-        structure_found = self._check_structure_indicators(platform, project_path)
-        if structure_found > 0:
-            structure_score = min(
-                structure_found * (self.rules.SCORE_WEIGHTS["structure_indicator"] / 2),
-                self.rules.SCORE_WEIGHTS["structure_indicator"]
-            )
-            score += structure_score
-        
-        # Check config files (NEW)
-        config_found = self._check_config_files(platform, files)
-        if config_found > 0:
-            config_score = min(
-                config_found * (self.rules.SCORE_WEIGHTS["config_file"] / 2),
-                self.rules.SCORE_WEIGHTS["config_file"]
-            )
-            score += config_score
-        
-        # Detect framework (enhanced)
-        framework = self._detect_framework(platform, files, project_path)
-        if framework:
-            score += self.rules.SCORE_WEIGHTS["framework_match"]
-        
-        # Check content patterns (NEW)
-        content_matches = self._check_content_patterns(platform, project_path, files)
-        if content_matches > 0:
-            content_score = min(
-                content_matches * (self.rules.SCORE_WEIGHTS["content_match"] / 2),
-                self.rules.SCORE_WEIGHTS["content_match"]
-            )
-            score += content_score
+        # Check primary and secondary files
+        primary_found, secondary_found, detected_files, build_tool = classify(index)
+        
+        # Check structure indicators, config files, framework and content patterns
+        structure_found = self._check_structure_indicators(platform, project_path, index)
+        config_found = self._check_config_files(platform, index)
+        framework = self._detect_framework(platform, index, project_path)
+        content_matches = self._check_content_patterns(platform, project_path, index)
+        
+        score = self.score(
+            primary_found, secondary_found, structure_found, config_found,
+            framework is not None, content_matches
+        )
         
         # Determine language and build requirements
-        language, build_required = self._get_language_info(platform)
+        language, build_required = self._get_language_info(platform.name)
         
         # Get build/install commands
-        build_command, install_command = self._get_commands(platform, build_tool)
+        build_command, install_command = self._get_commands(platform.name, build_tool)
         
         return DetectionResult(
             primary_language=language,
@@ -324,127 +681,96 @@ class ProjectDetector:
             build_required=build_required,
             build_command=build_command,
             install_command=install_command,
-            confidence_score=min(score, 1.0),
-            detected_files=list(set(detected_files))
+            confidence_score=score,
+            detected_files=list(detected_files)
         )
     
-    def _find_pattern_matches(self, pattern: str, files: List[str]) -> List[str]:
-        """Find files matching a pattern"""
-        matches = []
-        
-        if pattern.startswith("*"):
-            # Glob pattern
-            matches = [f for f in files if f.endswith(pattern[1:])]
-        elif "/" in pattern:
-            # Directory pattern
-            matches = [f for f in files if pattern in f]
-        else:
-            # Exact filename
-            matches = [f for f in files if os.path.basename(f) == pattern]
-        
-        return matches
-    
-    def _detect_framework(self, platform: str, files: List[str], project_path: str) -> Optional[str]:
+    def _detect_framework(self, platform: PlatformEntry, index: FileIndex, project_path: str) -> Optional[str]:
         """Detect framework for a given platform"""
-        framework_indicators = self.rules.PLATFORM_FILES[platform]["framework_indicators"]
-        
-        for framework_name, indicators in framework_indicators.items():
-            for indicator in indicators:
-                if platform == "nodejs":
-                    # Check package.json content for Node.js
-                    if self._check_package_json_dependency(project_path, indicator):
-                        return framework_name
-                elif platform == "dotnet":
-                    # Check .csproj file content for .NET
-                    if self._check_dotnet_project_file(files, project_path, indicator):
-                        return framework_name
-                elif any(indicator in f for f in files):
+        framework_indicators = platform.framework_indicators
+        
+        if platform.name == "nodejs":
+            # Check package.json content for Node.js (parsed once per scan)
+            dependencies = self._load_package_json_dependencies(project_path)
+            for framework_name, indicators in framework_indicators:
+                if any(indicator in dependencies for indicator in indicators):
                     return framework_name
+            return None
+        
+        if platform.name == "dotnet":
+            # Check file names (like Startup.cs) and .csproj content for .NET
+            csproj_content = self._read_dotnet_project_files(index, project_path)
+            joined_paths = index.joined_paths
+            for (framework_name, indicators), (_, needles) in zip(
+                framework_indicators, platform.framework_needles
+            ):
+                if (any(indicator in joined_paths for indicator in indicators)
+                        or any(needle in csproj_content for needle in needles)):
+                    return framework_name
+            return None
+        
+        for framework_name, indicators in framework_indicators:
+            if any(index.has_indicator(indicator) for indicator in indicators):
+                return framework_name
         
         return None
     
-    def _check_package_json_dependency(self, project_path: str, dependency: str) -> bool:
-        """Check if a dependency exists in package.json"""
+    def _load_package_json_dependencies(self, project_path: str) -> FrozenSet[str]:
+        """Return names of all dependencies, devDependencies and peerDependencies in package.json"""
         package_json_path = os.path.join(project_path, "package.json")
         
-        if not os.path.exists(package_json_path):
-            return False
-        
         try:
-            with open(package_json_path, 'r') as f:
-                package_data = json.load(f)
-                
-            deps = {}
-            deps.update(package_data.get("dependencies", {}))
-            deps.update(package_data.get("devDependencies", {}))
-            
-            return dependency in deps
-        except:
-            return False
-    
-    def _check_dotnet_project_file(self, files: List[str], project_path: str, indicator: str) -> bool:
-        """Check if an indicator exists in .csproj or .sln files"""
-        # First check if it's a filename (like Startup.cs)
-        if any(indicator in f for f in files):
-            return True
-        
-        # Then check content of .csproj files
-        csproj_files = [f for f in files if f.endswith('.csproj')]
-        
-        for csproj_file in csproj_files:
-            csproj_path = os.path.join(project_path, csproj_file)
-            try:
-                with open(csproj_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    if indicator in content:
-                        return True
-            except:
-                continue
-        
-        return False
+            mtime_ns = os.stat(package_json_path).st_mtime_ns
+            return _load_package_deps(package_json_path, mtime_ns)
+        except Exception:
+            return frozenset()
+    
+    def _read_dotnet_project_files(self, index: FileIndex, project_path: str) -> bytes:
+        """Contents of all scanned .csproj files, joined so each indicator is one search"""
+        return b"\n".join(
+            self._read_file_bytes(project_path + os.sep + csproj_file, max_bytes=-1)
+            for csproj_file in index.by_suffix.get('.csproj', [])
+        )
     
-    def _detect_nodejs_build_tool(self, files: List[str], project_path: str) -> Optional[BuildTool]:
+    @staticmethod
+    def _detect_nodejs_build_tool(by_basename: Dict[str, List[str]]) -> Optional[BuildTool]:
         """Detect Node.js build tool based on lock files"""
-        if any("pnpm-lock.yaml" in f for f in files):
-            return BuildTool.PNPM
-        elif any("yarn.lock" in f for f in files):
-            return BuildTool.YARN
-        elif any("package-lock.json" in f for f in files):
-            return BuildTool.NPM
+        for lock_file, build_tool in _NODEJS_LOCK_FILES:
+            if lock_file in by_basename:
+                return build_tool
         return BuildTool.NPM  # Default
     
-    def _get_language_info(self, platform: str) -> Tuple[LanguageType, bool]:
+    @staticmethod
+    def _get_language_info(platform: str) -> Tuple[LanguageType, bool]:
         """Get language type and build requirement"""
-        mapping = {
-            "java": (LanguageType.JAVA, True),
-            "nodejs": (LanguageType.NODEJS, True),
-            "python": (LanguageType.PYTHON, False),
-            "dotnet": (LanguageType.DOTNET, True),
-            "go": (LanguageType.GO, True),
-            "rust": (LanguageType.RUST, True),
-            "php": (LanguageType.PHP, False),
-            "ruby": (LanguageType.RUBY, False)
-        }
-        return mapping.get(platform, (LanguageType.UNKNOWN, False))
+        return _LANGUAGE_INFO.get(platform, (LanguageType.UNKNOWN, False))
     
     def _get_commands(self, platform: str, build_tool: Optional[BuildTool]) -> Tuple[Optional[str], Optional[str]]:
-        """Get build and install commands"""
+        """Get build and install commands (memoised per detector, since rules are fixed)"""
+        key = (platform, build_tool)
+        commands = self._commands.get(key)
+        if commands is not None:
+            return commands
+        
         build_commands = self.rules.BUILD_COMMANDS.get(platform, {})
         
         if platform == "python":
-            return None, "pip install -r requirements.txt"
-        
-        build_command = None
-        if build_tool:
-            build_command = build_commands.get(build_tool.value)
-            # If not found by build_tool value, check if there's a single default command
-            if not build_command and len(build_commands) == 1:
-                build_command = list(build_commands.values())[0]
-        
-        return build_command, None
+            commands = (None, "pip install -r requirements.txt")
+        else:
+            build_command = None
+            if build_tool:
+                build_command = build_commands.get(build_tool.value)
+                # If not found by build_tool value, check if there's a single default command
+                if not build_command and len(build_commands) == 1:
+                    build_command = list(build_commands.values())[0]
+            commands = (build_command, None)
+        
+        self._commands[key] = commands
+        return commands
     
     def _create_unknown_result(self) -> DetectionResult:
         """Create result for unknown/undetected projects"""
+        # Built per call: results are mutable and end up in responses
         return DetectionResult(
             primary_language=LanguageType.UNKNOWN,
             confidence_score=0.0,
@@ -1,12 +1,27 @@
+import io
 import os
 import shutil
 import tempfile
 import zipfile
 import subprocess
-from typing import Optional
+import threading
+from typing import Optional, Union, BinaryIO
 from pathlib import Path
 from urllib.parse import urlparse
 
+# Seconds between size checks of a clone in progress
+CLONE_SIZE_POLL_INTERVAL = 1.0
+
+# Seconds a clone may take before it is aborted
+CLONE_TIMEOUT = 60
+
+# Archive members under these directories are not extracted; they are
+# regenerated by installs and are never needed for detection or builds
+EXTRACT_SKIP_DIRS = frozenset({"node_modules", ".git", "__pycache__"})
+
+# Largest allowed ratio of uncompressed archive contents to the size limit
+ZIP_MAX_EXPANSION = 10
+
 class RepoHandler:
     """Handle GitHub repository cloning and ZIP extraction"""
     
@@ -15,18 +30,51 @@ class RepoHandler:
         self.max_size_bytes = max_size_mb * 1024 * 1024
     
     def process_repository(self, github_url: Optional[str] = None, 
-                          zip_file: Optional[bytes] = None) -> str:
+                          zip_file: Optional[Union[bytes, BinaryIO]] = None,
+                          zip_path: Optional[str] = None) -> str:
         """
-        Process repository from GitHub URL or ZIP file
+        Process repository from GitHub URL or ZIP file (raw bytes, a binary file
+        object, or the path of an archive already on disk)
         Returns: Path to extracted repository
         """
         if github_url:
             return self._clone_github_repo(github_url)
+        elif zip_path:
+            return self._extract_zip(zip_path)
         elif zip_file:
             return self._extract_zip(zip_file)
         else:
             raise ValueError("Either github_url or zip_file must be provided")
     
+    def get_head_commit(self, repo_dir: str) -> Optional[str]:
+        """
+        Read the commit checked out in a clone from its .git directory, without running git
+        Returns: Commit SHA, or None if repo_dir is not a readable clone
+        """
+        git_dir = os.path.join(repo_dir, ".git")
+        try:
+            with open(os.path.join(git_dir, "HEAD")) as f:
+                head = f.read().strip()
+            if not head.startswith("ref: "):
+                return head or None  # Detached HEAD holds the SHA itself
+            
+            ref = head[5:]
+            try:
+                with open(os.path.join(git_dir, *ref.split("/"))) as f:
+                    return f.read().strip() or None
+            except FileNotFoundError:
+                pass
+            
+            # Refs written by the clone may only exist in packed-refs
+            with open(os.path.join(git_dir, "packed-refs")) as f:
+                for line in f:
+                    sha, _, name = line.strip().partition(" ")
+                    if name == ref:
+                        return sha
+        except OSError:
+            pass
+        return None
+    
     def _clone_github_repo(self, github_url: str) -> str:
         """Clone GitHub repository to temporary directory"""
         # Validate GitHub URL
@@ -37,15 +85,10 @@ class RepoHandler:
         temp_dir = tempfile.mkdtemp(prefix="repo_scan_")
         
         try:
-            # Clone repository
-            result = subprocess.run([
-                "git", "clone", "--depth", "1", github_url, temp_dir
-            ], capture_output=True, text=True, timeout=60)
+            # Clone repository, aborting as soon as it outgrows the limit
+            self._clone_with_git(github_url, temp_dir)
             
-            if result.returncode != 0:
-                raise RuntimeError(f"Failed to clone repository: {result.stderr}")
-            
-            # Check size
+            # Check size (checkout can be larger than the transfer)
             if self._get_directory_size(temp_dir) > self.max_size_bytes:
                 raise ValueError(f"Repository size exceeds {self.max_size_mb}MB limit")
             
@@ -55,25 +98,85 @@ class RepoHandler:
             self.cleanup_directory(temp_dir)
             raise e
     
-    def _extract_zip(self, zip_data: bytes) -> str:
-        """Extract ZIP file to temporary directory"""
-        if len(zip_data) > self.max_size_bytes:
+    def _clone_with_git(self, github_url: str, temp_dir: str) -> None:
+        """Shallow-clone with the git CLI, aborting once the checkout outgrows the limit"""
+        proc = subprocess.Popen([
+            "git", "clone", "--depth", "1", github_url, temp_dir
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        exceeded = threading.Event()
+        done = threading.Event()
+        watcher = threading.Thread(
+            target=self._watch_clone_size, args=(proc, temp_dir, exceeded, done), daemon=True
+        )
+        watcher.start()
+        
+        try:
+            _, stderr = proc.communicate(timeout=CLONE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            done.set()
+            watcher.join()
+        
+        if exceeded.is_set():
+            raise ValueError(f"Repository size exceeds {self.max_size_mb}MB limit")
+        
+        if proc.returncode != 0:
+            raise RuntimeError(f"Failed to clone repository: {stderr}")
+    
+    def _watch_clone_size(
+        self,
+        proc: subprocess.Popen,
+        directory: str,
+        exceeded: threading.Event,
+        done: threading.Event
+    ) -> None:
+        """Kill a running clone once directory grows past the size limit"""
+        while not done.wait(CLONE_SIZE_POLL_INTERVAL):
+            if self._get_directory_size(directory) > self.max_size_bytes:
+                exceeded.set()
+                proc.kill()
+                return
+    
+    def _extract_zip(self, zip_data: Union[bytes, BinaryIO, str]) -> str:
+        """Extract ZIP file (bytes, binary file object or path) to temporary directory"""
+        if isinstance(zip_data, str):
+            zip_size = os.path.getsize(zip_data)
+        elif isinstance(zip_data, (bytes, bytearray)):
+            zip_size = len(zip_data)
+        else:
+            zip_size = zip_data.seek(0, os.SEEK_END)
+            zip_data.seek(0)
+        
+        if zip_size > self.max_size_bytes:
             raise ValueError(f"ZIP file size exceeds {self.max_size_mb}MB limit")
         
         temp_dir = tempfile.mkdtemp(prefix="repo_scan_")
         
         try:
-            # Save ZIP to temporary file
-            zip_path = os.path.join(temp_dir, "repo.zip")
-            with open(zip_path, 'wb') as f:
-                f.write(zip_data)
+            # Read the archive where it already is (path, file object or memory)
+            # instead of copying it to disk first
+            if isinstance(zip_data, (bytes, bytearray)):
+                zip_source = io.BytesIO(zip_data)
+            else:
+                zip_source = zip_data
             
             # Extract ZIP
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Remove ZIP file
-            os.remove(zip_path)
+            with zipfile.ZipFile(zip_source, 'r') as zip_ref:
+                members = [
+                    info for info in zip_ref.infolist()
+                    if EXTRACT_SKIP_DIRS.isdisjoint(info.filename.split("/")[:-1])
+                ]
+                
+                # Reject zip bombs before writing anything
+                if sum(info.file_size for info in members) > self.max_size_bytes * ZIP_MAX_EXPANSION:
+                    raise ValueError(
+                        f"ZIP contents exceed {self.max_size_mb * ZIP_MAX_EXPANSION}MB when extracted"
+                    )
+                
+                zip_ref.extractall(temp_dir, members=members)
             
             # Find the extracted directory (usually has one root folder)
             extracted_items = os.listdir(temp_dir)
@@ -98,13 +201,20 @@ class RepoHandler:
     def _get_directory_size(self, directory: str) -> int:
         """Calculate total size of directory"""
         total = 0
-        for dirpath, dirnames, filenames in os.walk(directory):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                try:
-                    total += os.path.getsize(fp)
-                except OSError:
-                    continue
+        stack = [directory]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            else:
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
         return total
     
     def cleanup_directory(self, directory: str) -> None:
@@ -1,6 +1,47 @@
-from typing import Dict, List, Tuple, Any
-import json
-import os
+from typing import Dict, List, Tuple, Any, NamedTuple, FrozenSet, Callable
+import functools
+from types import MappingProxyType
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; substring tests are used instead
+    ahocorasick = None
+
+# Needle count from which one Aho-Corasick pass beats repeated bytes.find calls
+AHO_CORASICK_MIN_NEEDLES = 8
+
+def _make_content_matcher(needles: Tuple[bytes, ...]) -> Callable[[bytes], bool]:
+    """Build a test for whether any of the needles occurs in a lower-cased file head"""
+    if ahocorasick is None or len(needles) < AHO_CORASICK_MIN_NEEDLES:
+        return lambda content: any(needle in content for needle in needles)
+    
+    # The automaton works on str; latin-1 maps bytes to code points one to one
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle.decode("latin-1"), needle)
+    automaton.make_automaton()
+    return lambda content: next(automaton.iter(content.decode("latin-1")), None) is not None
+
+class PatternTable(NamedTuple):
+    """Primary/secondary file patterns compiled to integer ids for one-pass classification"""
+    pattern_ids: Dict[str, int]                 # pattern string -> id
+    by_basename: Dict[str, Tuple[int, ...]]     # exact filename -> ids
+    by_suffix: Dict[str, Tuple[int, ...]]       # extension (from "*.ext") -> ids
+    by_fragment: Tuple[Tuple[str, int], ...]    # path fragment (contains "/") -> id
+    indexed_basenames: FrozenSet[str]           # filenames any rule looks up by name
+    indexed_suffixes: FrozenSet[str]            # extensions any rule looks up
+    indexed_stems: FrozenSet[str]               # extensionless names config files are matched by
+
+class PlatformEntry(NamedTuple):
+    """One platform's rules flattened to tuples, with primary/secondary patterns as ids"""
+    name: str
+    primary_ids: Tuple[int, ...]
+    secondary_ids: Tuple[int, ...]
+    structure_indicators: Tuple[str, ...]
+    config_files: Tuple[str, ...]
+    framework_indicators: Tuple[Tuple[str, Tuple[str, ...]], ...]  # (framework, indicators)
+    framework_needles: Tuple[Tuple[str, Tuple[bytes, ...]], ...]   # framework_indicators encoded, for file contents
+    content_patterns: Tuple[Tuple[str, Tuple[bytes, ...]], ...]    # (file pattern, lower-cased byte needles, longest first)
 
 class DetectionRules:
     """Centralized detection rules for different platforms"""
@@ -225,9 +266,124 @@ class DetectionRules:
         }
     }
     
+    # Bytes of each file searched for content patterns; the markers they look for
+    # (imports, annotations, dependency declarations) sit near the top of a file
+    CONTENT_SCAN_LIMIT = 8192
+    
     # Directories to ignore during scanning
-    IGNORED_DIRS = {
+    IGNORED_DIRS = frozenset({
         "node_modules", ".git", "venv", "__pycache__", 
         "target", "build", "dist", ".vscode", ".idea",
         "bin", "obj", "vendor"
-    }
+    })
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def compiled_patterns(cls) -> PatternTable:
+        """Compile primary/secondary patterns of all platforms once per process"""
+        pattern_ids: Dict[str, int] = {}
+        by_basename: Dict[str, List[int]] = {}
+        by_suffix: Dict[str, List[int]] = {}
+        by_fragment: List[Tuple[str, int]] = []
+        
+        for platform_data in cls.PLATFORM_FILES.values():
+            for pattern in platform_data["primary"] + platform_data["secondary"]:
+                if pattern in pattern_ids:
+                    continue
+                pattern_id = len(pattern_ids)
+                pattern_ids[pattern] = pattern_id
+                
+                if pattern.startswith("*"):
+                    by_suffix.setdefault(pattern[1:], []).append(pattern_id)
+                elif "/" in pattern:
+                    by_fragment.append((pattern, pattern_id))
+                else:
+                    by_basename.setdefault(pattern, []).append(pattern_id)
+        
+        # Names, extensions and stems that some rule looks up in the file index;
+        # files matching none of them only need to appear in the plain file list
+        indexed_basenames = set(by_basename)
+        indexed_suffixes = set(by_suffix)
+        indexed_stems = set()
+        for platform_data in cls.PLATFORM_FILES.values():
+            for config_file in platform_data.get("config_files", []):
+                if "/" not in config_file:
+                    indexed_basenames.add(config_file)
+                    indexed_stems.add(config_file)
+            for indicators in platform_data["framework_indicators"].values():
+                indexed_basenames.update(indicators)
+                indexed_suffixes.update(i for i in indicators if i.startswith("."))
+            for file_pattern in platform_data.get("content_patterns", {}):
+                if file_pattern.startswith("*"):
+                    indexed_suffixes.add(file_pattern[1:])
+                else:
+                    indexed_basenames.add(file_pattern)
+        
+        return PatternTable(
+            pattern_ids=pattern_ids,
+            by_basename={k: tuple(v) for k, v in by_basename.items()},
+            by_suffix={k: tuple(v) for k, v in by_suffix.items()},
+            by_fragment=tuple(by_fragment),
+            indexed_basenames=frozenset(indexed_basenames),
+            indexed_suffixes=frozenset(indexed_suffixes),
+            indexed_stems=frozenset(indexed_stems)
+        )
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def platform_table(cls) -> Tuple[PlatformEntry, ...]:
+        """Flatten PLATFORM_FILES into PlatformEntry tuples once per process"""
+        pattern_ids = cls.compiled_patterns().pattern_ids
+        return tuple(
+            PlatformEntry(
+                name=platform,
+                primary_ids=tuple(pattern_ids[p] for p in platform_data["primary"]),
+                secondary_ids=tuple(pattern_ids[p] for p in platform_data["secondary"]),
+                structure_indicators=tuple(platform_data.get("structure_indicators", ())),
+                config_files=tuple(platform_data.get("config_files", ())),
+                framework_indicators=tuple(
+                    (framework, tuple(indicators))
+                    for framework, indicators in platform_data["framework_indicators"].items()
+                ),
+                framework_needles=tuple(
+                    (framework, tuple(indicator.encode() for indicator in indicators))
+                    for framework, indicators in platform_data["framework_indicators"].items()
+                ),
+                content_patterns=tuple(
+                    (file_pattern, tuple(sorted(
+                        (pattern.lower().encode() for pattern in patterns), key=len, reverse=True
+                    )))
+                    for file_pattern, patterns in platform_data.get("content_patterns", {}).items()
+                )
+            )
+            for platform, platform_data in cls.PLATFORM_FILES.items()
+        )
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def content_matchers(cls) -> Dict[str, Tuple[Tuple[str, Callable[[bytes], bool]], ...]]:
+        """Build each platform's content-pattern matchers (automata included) once per process"""
+        return {
+            platform.name: tuple(
+                (file_pattern, _make_content_matcher(needles))
+                for file_pattern, needles in platform.content_patterns
+            )
+            for platform in cls.platform_table()
+        }
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# The compiled tables above are cached per process, so the source rules are
+# frozen at every level to keep them from drifting out of sync through runtime mutation
+DetectionRules.PLATFORM_FILES = _freeze(DetectionRules.PLATFORM_FILES)
+DetectionRules.SCORE_WEIGHTS = _freeze(DetectionRules.SCORE_WEIGHTS)
+DetectionRules.BUILD_COMMANDS = _freeze(DetectionRules.BUILD_COMMANDS)
+
+# Shared rules instance; the rules are static, so every detector can reuse it
+RULES = DetectionRules()
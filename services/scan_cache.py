@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from models.response_models import MultiDetectionResult
+
+class ScanCache:
+    """
+    LRU cache of scan results keyed by repository content.
+    
+    Keys are content hashes of uploaded archives or a GitHub URL pinned to its
+    commit, so a hit is byte-identical input and detection can be skipped entirely.
+    Only detections are cached: every request still extracts or clones its own
+    tree, owns it, and gets the cached detections pointed at it.
+    Entries are also written to disk so they survive restarts and are shared
+    between worker processes; the directory is capped at maxsize files, dropping
+    the least recently used.
+    """
+    
+    def __init__(self, maxsize: int = 256, cache_dir: Optional[str] = None):
+        self.maxsize = maxsize
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: "OrderedDict[str, MultiDetectionResult]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str, project_path: Optional[str] = None) -> Optional[MultiDetectionResult]:
+        """
+        Return a copy of the cached result for key, or None on a miss
+        
+        Args:
+            key: Cache key
+            project_path: Directory the caller scanned, set on the returned copy
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+        
+        if result is None:
+            result = self._load(key)
+            if result is None:
+                return None
+            self._remember(key, result)
+        
+        # Results are mutable models, so callers never share the cached instance
+        return result.model_copy(deep=True, update={"project_path": project_path})
+    
+    def put(self, key: str, result: MultiDetectionResult) -> None:
+        """Store a copy of result under key in memory and on disk, without its project_path"""
+        result = result.model_copy(deep=True, update={"project_path": None})
+        self._remember(key, result)
+        
+        if self.cache_dir is not None:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self._path(key).write_text(result.model_dump_json())
+                self._prune()
+            except OSError:
+                pass  # Disk cache is best effort
+    
+    def discard(self, key: str) -> None:
+        """Drop key from memory and disk"""
+        with self._lock:
+            self._entries.pop(key, None)
+        
+        if self.cache_dir is not None:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+    
+    def _remember(self, key: str, result: MultiDetectionResult) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def _load(self, key: str) -> Optional[MultiDetectionResult]:
+        if self.cache_dir is None:
+            return None
+        
+        path = self._path(key)
+        try:
+            result = MultiDetectionResult.model_validate_json(path.read_bytes())
+            os.utime(path)  # Mark as recently used for _prune
+        except (OSError, ValueError):
+            return None
+        return result
+    
+    def _prune(self) -> None:
+        """Delete the least recently used files beyond maxsize from the cache directory"""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                    except OSError:
+                        continue
+        
+        if len(entries) <= self.maxsize:
+            return
+        
+        entries.sort()
+        for _, path in entries[:len(entries) - self.maxsize]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # Already removed by another worker
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
@@ -1,136 +1,157 @@
 import unittest
 import tempfile
 import os
-import json
-from pathlib import Path
+
+from pyfakefs.fake_filesystem_unittest import TestCase
 
 from services.detector import ProjectDetector
 from models.response_models import LanguageType, ConfidenceLevel
 
-class TestProjectDetector(unittest.TestCase):
+# Static package.json payloads, written verbatim
+PACKAGE_JSON_REACT = b'{"name": "test-app", "dependencies": {"react": "^18.0.0"}}'
+PACKAGE_JSON_MINIMAL = b'{"name": "test"}'
+
+class TestProjectDetector(TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build every fixture tree once; scans never modify them"""
+        # Project trees are built in an in-memory filesystem
+        cls.setUpClassPyfakefs()
+        cls.root = tempfile.mkdtemp()
+        
+        # Maven project structure
+        os.makedirs(os.path.join(cls.root, "maven", "src", "main", "java"))
+        cls._write("maven/pom.xml", b"<project></project>")
+        
+        # Node.js project with React and an npm lock file
+        cls._write("node/package.json", PACKAGE_JSON_REACT)
+        cls._write("node/package-lock.json", b"{}")
+        
+        # Python project with Flask
+        cls._write("python/requirements.txt", b"flask==2.0.0\n")
+        cls._write("python/app.py", b"from flask import Flask\n")
+        
+        # Some random files
+        cls._write("unknown/random.txt", b"random content")
+        
+        # A complete Spring Boot project for high confidence
+        os.makedirs(os.path.join(cls.root, "springboot", "src/test/java"))
+        cls._write("springboot/pom.xml", b"""<?xml version="1.0"?>
+<project>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-web</artifactId>
+</project>""")
+        cls._write("springboot/src/main/resources/application.properties", b"server.port=8080\n")
+        cls._write("springboot/src/main/java/com/example/App.java", b"@SpringBootApplication\npublic class App {}")
+        
+        # Minimal Node.js project
+        cls._write("minimal/package.json", PACKAGE_JSON_MINIMAL)
+    
+    @classmethod
+    def _write(cls, relative_path: str, content: bytes) -> None:
+        """Write a fixture file below the class root, creating its directories"""
+        path = os.path.join(cls.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
     
     def setUp(self):
         self.detector = ProjectDetector()
     
+    def tearDown(self):
+        self.detector.close()
+    
+    def fixture(self, name: str) -> str:
+        """Path of a fixture tree built in setUpClass"""
+        return os.path.join(self.root, name)
+    
     def test_java_maven_detection(self):
         """Test Java Maven project detection"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create Maven project structure
-            os.makedirs(os.path.join(temp_dir, "src", "main", "java"))
-            
-            # Create pom.xml
-            with open(os.path.join(temp_dir, "pom.xml"), "w") as f:
-                f.write("<project></project>")
-            
-            result = self.detector.scan_project(temp_dir)
-            
-            self.assertEqual(result.primary.primary_language, LanguageType.JAVA)
-            self.assertEqual(result.primary.build_tool.value, "Maven")
-            self.assertTrue(result.primary.build_required)
-            self.assertGreater(result.primary.confidence_score, 0.5)
+        result = self.detector.scan_project(self.fixture("maven"))
+        
+        self.assertEqual(result.primary.primary_language, LanguageType.JAVA)
+        self.assertEqual(result.primary.build_tool.value, "Maven")
+        self.assertTrue(result.primary.build_required)
+        self.assertGreater(result.primary.confidence_score, 0.5)
     
     def test_nodejs_detection(self):
         """Test Node.js project detection"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create package.json
-            package_data = {
-                "name": "test-app",
-                "dependencies": {
-                    "react": "^18.0.0"
-                }
-            }
-            
-            with open(os.path.join(temp_dir, "package.json"), "w") as f:
-                json.dump(package_data, f)
-            
-            # Create package-lock.json
-            with open(os.path.join(temp_dir, "package-lock.json"), "w") as f:
-                f.write("{}")
-            
-            result = self.detector.scan_project(temp_dir)
-            
-            self.assertEqual(result.primary.primary_language, LanguageType.NODEJS)
-            self.assertEqual(result.primary.build_tool.value, "npm")
-            self.assertEqual(result.primary.framework, "React")
+        result = self.detector.scan_project(self.fixture("node"))
+        
+        self.assertEqual(result.primary.primary_language, LanguageType.NODEJS)
+        self.assertEqual(result.primary.build_tool.value, "npm")
+        self.assertEqual(result.primary.framework, "React")
     
     def test_python_detection(self):
         """Test Python project detection"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create requirements.txt
-            with open(os.path.join(temp_dir, "requirements.txt"), "w") as f:
-                f.write("flask==2.0.0\n")
-            
-            # Create app.py
-            with open(os.path.join(temp_dir, "app.py"), "w") as f:
-                f.write("from flask import Flask\n")
-            
-            result = self.detector.scan_project(temp_dir)
-            
-            self.assertEqual(result.primary.primary_language, LanguageType.PYTHON)
-            self.assertFalse(result.primary.build_required)
-            self.assertEqual(result.primary.framework, "Flask")
+        result = self.detector.scan_project(self.fixture("python"))
+        
+        self.assertEqual(result.primary.primary_language, LanguageType.PYTHON)
+        self.assertFalse(result.primary.build_required)
+        self.assertEqual(result.primary.framework, "Flask")
     
     def test_unknown_project(self):
         """Test unknown project type"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create some random files
-            with open(os.path.join(temp_dir, "random.txt"), "w") as f:
-                f.write("random content")
-            
-            result = self.detector.scan_project(temp_dir)
-            
-            self.assertEqual(result.primary.primary_language, LanguageType.UNKNOWN)
-            self.assertEqual(result.primary.confidence_score, 0.0)
+        result = self.detector.scan_project(self.fixture("unknown"))
+        
+        self.assertEqual(result.primary.primary_language, LanguageType.UNKNOWN)
+        self.assertEqual(result.primary.confidence_score, 0.0)
     
     def test_confidence_levels(self):
         """Test confidence level classification"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create a complete Spring Boot project for high confidence
-            os.makedirs(os.path.join(temp_dir, "src/main/java/com/example"), exist_ok=True)
-            os.makedirs(os.path.join(temp_dir, "src/main/resources"), exist_ok=True)
-            os.makedirs(os.path.join(temp_dir, "src/test/java"), exist_ok=True)
-            
-            # pom.xml with Spring Boot content
-            with open(os.path.join(temp_dir, "pom.xml"), "w") as f:
-                f.write("""<?xml version="1.0"?>
-<project>
-    <groupId>org.springframework.boot</groupId>
-    <artifactId>spring-boot-starter-web</artifactId>
-</project>""")
-            
-            # application.properties
-            with open(os.path.join(temp_dir, "src/main/resources/application.properties"), "w") as f:
-                f.write("server.port=8080\n")
-            
-            # Main Java file with annotations
-            with open(os.path.join(temp_dir, "src/main/java/com/example/App.java"), "w") as f:
-                f.write("@SpringBootApplication\npublic class App {}")
-            
-            result = self.detector.scan_project(temp_dir)
-            
-            self.assertEqual(result.primary.primary_language, LanguageType.JAVA)
-            self.assertGreaterEqual(result.primary.confidence_score, 0.65)
-            self.assertIn(result.primary.confidence_level, [ConfidenceLevel.HIGH, ConfidenceLevel.VERY_HIGH])
+        result = self.detector.scan_project(self.fixture("springboot"))
+        
+        self.assertEqual(result.primary.primary_language, LanguageType.JAVA)
+        self.assertGreaterEqual(result.primary.confidence_score, 0.65)
+        self.assertIn(result.primary.confidence_level, [ConfidenceLevel.HIGH, ConfidenceLevel.VERY_HIGH])
     
     def test_min_confidence_threshold(self):
         """Test minimum confidence threshold filtering"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create minimal project
-            with open(os.path.join(temp_dir, "package.json"), "w") as f:
-                json.dump({"name": "test"}, f)
-            
-            # Test with high threshold
-            detector_strict = ProjectDetector(min_confidence=0.80)
-            result_strict = detector_strict.scan_project(temp_dir)
-            
-            # Should still return something (might be unknown if threshold not met)
-            self.assertIsNotNone(result_strict.primary)
-            
-            # Test with low threshold
-            detector_lenient = ProjectDetector(min_confidence=0.30)
-            result_lenient = detector_lenient.scan_project(temp_dir)
-            
-            self.assertEqual(result_lenient.primary.primary_language, LanguageType.NODEJS)
+        # Test with high threshold
+        with ProjectDetector(min_confidence=0.80) as detector_strict:
+            result_strict = detector_strict.scan_project(self.fixture("minimal"))
+        
+        # Should still return something (might be unknown if threshold not met)
+        self.assertIsNotNone(result_strict.primary)
+        
+        # Test with low threshold
+        with ProjectDetector(min_confidence=0.30) as detector_lenient:
+            result_lenient = detector_lenient.scan_project(self.fixture("minimal"))
+        
+        self.assertEqual(result_lenient.primary.primary_language, LanguageType.NODEJS)
+    
+    def test_max_depth_zero(self):
+        """Test that a scan with max_depth=0 lists no files"""
+        result = self.detector.scan_project(self.fixture("python"), max_depth=0)
+        
+        self.assertEqual(result.primary.primary_language, LanguageType.UNKNOWN)
+        self.assertEqual(result.primary.detected_files, [])
+    
+    def test_scan_result_cache(self):
+        """Test that repeated scans are memoised until the project root changes"""
+        detector = ProjectDetector(result_cache_size=8)
+        self.addCleanup(detector.close)
+        self._write("cached/requirements.txt", b"flask==2.0.0\n")
+        first = detector.scan_project(self.fixture("cached"))
+        
+        # Returned results are copies, so callers may modify them freely
+        first.primary.detected_files.append("leak")
+        first.detections.clear()
+        again = detector.scan_project(self.fixture("cached"))
+        self.assertEqual(again.primary.detected_files, ["requirements.txt"])
+        self.assertEqual(len(again.detections), 1)
+        
+        # The in-memory filesystem does not touch the parent on create, so bump it here
+        self._write("cached/setup.py", b"")
+        mtime_ns = os.stat(self.fixture("cached")).st_mtime_ns + 1
+        os.utime(self.fixture("cached"), ns=(mtime_ns, mtime_ns))
+        changed = detector.scan_project(self.fixture("cached"))
+        
+        self.assertIn("setup.py", changed.primary.detected_files)
+        
+        detector.clear_cache()
+        self.assertEqual(detector.scan_project(self.fixture("cached")), changed)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+
+from pyfakefs.fake_filesystem_unittest import TestCase
+
+from services.scan_cache import ScanCache
+from models.response_models import MultiDetectionResult, DetectionResult, LanguageType
+
+CACHE_DIR = "/cache/scans"
+
+class TestScanCache(TestCase):
+    
+    def setUp(self):
+        self.setUpPyfakefs()
+    
+    def result(self, project_path: str) -> MultiDetectionResult:
+        """Scan result for a Python project at project_path"""
+        detection = DetectionResult(
+            primary_language=LanguageType.PYTHON,
+            confidence_score=0.8,
+            detected_files=["requirements.txt"]
+        )
+        return MultiDetectionResult(detections=[detection], primary=detection, project_path=project_path)
+    
+    def test_get_put(self):
+        """Test that stored results are returned from memory and from disk"""
+        cache = ScanCache(cache_dir=CACHE_DIR)
+        self.assertIsNone(cache.get("a"))
+        
+        cache.put("a", self.result("/projects/a"))
+        self.assertEqual(cache.get("a", "/projects/a2"), self.result("/projects/a2"))
+        
+        # A fresh instance (another worker, or after a restart) reads it back from disk
+        self.assertEqual(ScanCache(cache_dir=CACHE_DIR).get("a", "/projects/a3"), self.result("/projects/a3"))
+    
+    def test_lru_bound(self):
+        """Test that the least recently used entry is evicted from memory"""
+        cache = ScanCache(maxsize=2)
+        cache.put("a", self.result("/projects/a"))
+        cache.put("b", self.result("/projects/b"))
+        cache.get("a")
+        cache.put("c", self.result("/projects/c"))
+        
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+    
+    def test_disk_bound(self):
+        """Test that the cache directory never holds more than maxsize entries"""
+        cache = ScanCache(maxsize=2, cache_dir=CACHE_DIR)
+        cache.put("a", self.result("/projects/a"))
+        cache.put("b", self.result("/projects/b"))
+        os.utime(os.path.join(CACHE_DIR, "a.json"), ns=(1, 1))
+        os.utime(os.path.join(CACHE_DIR, "b.json"), ns=(2, 2))
+        cache.put("c", self.result("/projects/c"))
+        
+        self.assertEqual(sorted(os.listdir(CACHE_DIR)), ["b.json", "c.json"])
+    
+    def test_results_are_copies(self):
+        """Test that callers never share the cached result or its project directory"""
+        cache = ScanCache()
+        stored = self.result("/projects/a")
+        cache.put("a", stored)
+        stored.primary.detected_files.append("leak")
+        
+        first = cache.get("a", "/projects/b")
+        first.detections.clear()
+        second = cache.get("a")
+        
+        self.assertEqual(len(second.detections), 1)
+        self.assertEqual(second.primary.detected_files, ["requirements.txt"])
+        self.assertIsNone(second.project_path)
+
+if __name__ == "__main__":
+    unittest.main()